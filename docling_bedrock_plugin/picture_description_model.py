@@ -4,24 +4,215 @@ This module integrates the AWS Bedrock multimodal models (like Claude 3 Sonnet/H
 into the Docling framework for automated image description tasks.
 """
 from collections.abc import Iterable
+from concurrent.futures import Future
 from pathlib import Path
+import asyncio
+import atexit
 import base64
+import functools
+import hashlib
 from io import BytesIO
 import json
 import logging
-from typing import Optional, Type, Union, List
-from concurrent.futures import ThreadPoolExecutor
-
-import boto3
+import os
+import random
+import tempfile
+import threading
+from typing import Any, Coroutine, Dict, Optional, Tuple, Type, TypeVar, Union, List
+
+import aioboto3
+from aiobotocore.config import AioConfig
+from botocore.exceptions import ClientError, ConnectionError as BotoConnectionError, HTTPClientError
 from PIL import Image
 
+from docling_core.types.doc import DoclingDocument, NodeItem, PictureItem
+from docling_core.types.doc.document import PictureDescriptionData
 from docling.datamodel.pipeline_options import AcceleratorOptions
+from docling.models.base_model import ItemAndImageEnrichmentElement
 from docling.exceptions import OperationNotAllowed
 from docling.models.picture_description_base_model import PictureDescriptionBaseModel
 from docling_bedrock_plugin.pipeline_options import PictureDescriptionBedrockApiOptions
 
 _log = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Idle connections are kept open this long (seconds) so later requests skip the TLS handshake.
+_KEEPALIVE_TIMEOUT = 60
+
+# Supported models that accept `performanceConfigLatency="optimized"`. Matched as
+# substrings so cross-region inference profile IDs (e.g. "us.anthropic...") are covered too.
+_LATENCY_OPTIMIZED_MODELS = ("anthropic.claude-3-5-haiku-20241022",)
+
+# Prefixes of the placeholder strings returned for images that could not be described.
+_ERROR_PREFIXES = ("Error processing image", "Unsupported model")
+# Upper bound on the number of descriptions each model instance keeps for deduplication.
+_DESCRIPTION_CACHE_SIZE = 4096
+# Output token limit shared by all Claude 3 models; batched requests are
+# sized so that `max_tokens` per image fits within it.
+_MAX_OUTPUT_TOKENS = 4096
+
+# Error codes Bedrock returns when a request is rejected for exceeding quotas.
+_THROTTLING_ERROR_CODES = ("ThrottlingException", "TooManyRequestsException")
+# Error codes of transient server-side failures that are worth retrying.
+_TRANSIENT_ERROR_CODES = (
+    "ServiceUnavailableException",
+    "InternalServerException",
+    "ModelNotReadyException",
+    "ModelTimeoutException",
+)
+# Throttled and transiently failed requests are re-queued up to this many
+# times, with exponential backoff (seconds) and full jitter between attempts.
+_MAX_RETRIES = 6
+_BACKOFF_BASE = 0.5
+_BACKOFF_MAX = 20.0
+
+# aioboto3 clients are bound to the event loop they were opened on, so all
+# Bedrock traffic runs on one background loop. This lets a single client (and
+# its pool of warm connections) be shared by every model instance and call.
+_lock = threading.Lock()
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_clients: Dict[Tuple[Optional[str], Optional[str], int, float], Any] = {}
+
+
+def _get_event_loop() -> asyncio.AbstractEventLoop:
+    """Returns the background event loop used for Bedrock calls, starting it on first use."""
+    global _loop
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever, name="bedrock-event-loop", daemon=True
+            ).start()
+            atexit.register(_close_clients)
+        return _loop
+
+
+def _run(coro: Coroutine[Any, Any, T]) -> T:
+    """Runs `coro` on the background event loop and blocks until it completes."""
+    return asyncio.run_coroutine_threadsafe(coro, _get_event_loop()).result()
+
+
+@functools.lru_cache(maxsize=8)
+def _get_session(region_name: Optional[str], profile_name: Optional[str]) -> aioboto3.Session:
+    """Returns the shared aioboto3 Session for a (region, profile) pair.
+
+    Sessions are expensive to build (credential resolution, endpoint and
+    service model loading), so one is kept per pair for the life of the process.
+    """
+    session_kwargs = {}
+    if region_name:
+        session_kwargs["region_name"] = region_name
+    if profile_name:
+        session_kwargs["profile_name"] = profile_name
+    return aioboto3.Session(**session_kwargs)
+
+
+def _get_bedrock_client(
+    region_name: Optional[str],
+    profile_name: Optional[str],
+    max_pool_connections: int,
+    timeout: float,
+):
+    """Returns the shared Bedrock Runtime client for the given settings.
+
+    The client is opened on the background event loop the first time a
+    combination of settings is requested and reused afterwards.
+    """
+    key = (region_name, profile_name, max_pool_connections, timeout)
+    loop = _get_event_loop()
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            config = AioConfig(
+                connector_args={"keepalive_timeout": _KEEPALIVE_TIMEOUT},
+                tcp_keepalive=True,
+                connect_timeout=timeout,
+                read_timeout=timeout,
+                max_pool_connections=max_pool_connections,
+                # Retries are done by _invoke_model; botocore retries would
+                # hide throttles from _AdaptiveLimiter and multiply the attempts.
+                retries={"total_max_attempts": 1, "mode": "standard"},
+            )
+            client_context = _get_session(region_name, profile_name).client(
+                service_name="bedrock-runtime", config=config
+            )
+            client = asyncio.run_coroutine_threadsafe(
+                client_context.__aenter__(), loop
+            ).result()
+            _clients[key] = client
+        return client
+
+
+def _is_claude_3(model_id: str) -> bool:
+    """Checks whether `model_id` is a Claude 3 model or inference profile."""
+    return model_id.startswith("anthropic.claude-3") or ".anthropic.claude-3" in model_id
+
+
+def _close_clients() -> None:
+    """Closes all shared Bedrock clients; registered to run at interpreter exit."""
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        try:
+            _run(client.close())
+        except Exception:
+            pass
+
+
+class _AdaptiveLimiter:
+    """Async semaphore whose limit adapts to Bedrock throttling (AIMD).
+
+    The number of requests allowed in flight starts at `max_limit`, is halved
+    once per congestion event and grows by one after `increase_after`
+    consecutive successes, never exceeding `max_limit`.
+
+    Entering the limiter yields the generation the request was admitted
+    under. The generation advances on every decrease, so throttles from
+    requests admitted before the last decrease are ignored rather than
+    halving the limit again for the same burst.
+    """
+
+    def __init__(self, max_limit: int, increase_after: int = 32):
+        self.max_limit = max(1, max_limit)
+        self.limit = self.max_limit
+        self.increase_after = increase_after
+        self._in_flight = 0
+        self._successes = 0
+        self._generation = 0
+        self._condition = asyncio.Condition()
+
+    async def __aenter__(self) -> int:
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+            return self._generation
+
+    async def __aexit__(self, *exc_info) -> None:
+        async with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def on_success(self) -> None:
+        """Records a successful request, raising the limit additively."""
+        self._successes += 1
+        if self._successes >= self.increase_after and self.limit < self.max_limit:
+            self.limit += 1
+            self._successes = 0
+
+    def on_throttle(self, generation: int) -> None:
+        """Records a throttled request, halving the limit once per congestion event.
+
+        Args:
+            generation: The generation the throttled request was admitted under.
+        """
+        self._successes = 0
+        if generation != self._generation:
+            return
+        self.limit = max(1, self.limit // 2)
+        self._generation += 1
+
 
 class PictureDescriptionBedrockApiModel(PictureDescriptionBaseModel):
     """Generates picture descriptions using AWS Bedrock multimodal models.
@@ -31,11 +222,12 @@ class PictureDescriptionBedrockApiModel(PictureDescriptionBaseModel):
     textual description returned by the model.
 
     Handles image encoding, API request construction, response parsing,
-    and concurrent processing of multiple images using a thread pool.
+    and concurrent processing of multiple images using asyncio and aioboto3.
+    Duplicate images are described only once.
 
     Attributes:
         options (PictureDescriptionBedrockApiOptions): Configuration specific to Bedrock API calls.
-        bedrock_client (boto3.client): The initialized Bedrock Runtime client.
+        bedrock_client: The shared aioboto3 Bedrock Runtime client.
         provenance (str): Identifier for the description source ('amazon-bedrock').
     """
     @classmethod
@@ -53,7 +245,7 @@ class PictureDescriptionBedrockApiModel(PictureDescriptionBaseModel):
     ):
         """Initializes the Bedrock API model.
 
-        Sets up the Bedrock client connection based on provided options.
+        Looks up (or opens) the shared Bedrock client based on provided options.
         Validates if remote services are enabled.
 
         Args:
@@ -83,134 +275,500 @@ class PictureDescriptionBedrockApiModel(PictureDescriptionBaseModel):
                     "pipeline_options.enable_remote_services=True."
                 )
 
-            session_kwargs = {}
-            if self.options.profile_name:
-                session_kwargs["profile_name"] = self.options.profile_name
+            self.bedrock_client = _get_bedrock_client(
+                self.options.region_name,
+                self.options.profile_name,
+                self.options.max_pool_connections,
+                self.options.timeout,
+            )
+            self._limiter = _AdaptiveLimiter(self.options.max_concurrency)
+            self._descriptions: Dict[bytes, str] = {}
+            # Requests currently being described, keyed by image digest
+            self._in_flight: Dict[bytes, "asyncio.Future[str]"] = {}
 
-            session = boto3.Session(**session_kwargs)
-            client_kwargs = {}
-            if self.options.region_name:
-                client_kwargs["region_name"] = self.options.region_name
+    def __call__(
+        self,
+        doc: DoclingDocument,
+        element_batch: Iterable[ItemAndImageEnrichmentElement],
+    ) -> Iterable[NodeItem]:
+        """Annotates a batch of pictures, leaving skipped pictures unannotated.
+
+        The base implementation attaches every output as a description;
+        the empty outputs produced for images below `options.min_image_pixels`
+        are removed again so they do not show up as blank annotations.
+        """
+        for item in super().__call__(doc, element_batch):
+            if isinstance(item, PictureItem):
+                item.annotations = [
+                    annotation
+                    for annotation in item.annotations
+                    if not (
+                        isinstance(annotation, PictureDescriptionData)
+                        and annotation.provenance == self.provenance
+                        and not annotation.text
+                    )
+                ]
+            yield item
 
-            self.bedrock_client = session.client(
-                service_name="bedrock-runtime", **client_kwargs
+    def _encode_image(self, image: Image.Image) -> bytes:
+        """Encodes an image as JPEG bytes ready to send to Bedrock.
+
+        Images whose longest edge exceeds `options.max_image_edge` are
+        downscaled first, and transparent images are flattened onto a white
+        background. The passed image is never modified, since it may be the
+        picture cached on the document; callers that open an image file
+        themselves can `Image.draft` it before passing it in.
+
+        Args:
+            image: The PIL Image object to encode.
+
+        Returns:
+            The JPEG-encoded image.
+        """
+        max_edge = self.options.max_image_edge
+        if "A" in image.getbands() or "transparency" in image.info:
+            # JPEG has no alpha; flatten onto white so transparent areas don't turn black
+            rgba = image.convert("RGBA")
+            image = Image.new("RGB", rgba.size, (255, 255, 255))
+            image.paste(rgba, mask=rgba.getchannel("A"))
+        elif image.mode != "RGB":
+            image = image.convert("RGB")
+
+        width, height = image.size
+        scale = min(1.0, max_edge / max(width, height))
+        if scale < 1:
+            image = image.resize(
+                (max(1, round(width * scale)), max(1, round(height * scale))),
+                Image.LANCZOS,
             )
 
-    def _call_bedrock_for_image(self, image: Image.Image) -> str:
+        img_buffer = BytesIO()
+        image.save(
+            img_buffer, format="JPEG", quality=self.options.jpeg_quality, optimize=False
+        )
+        return img_buffer.getvalue()
+
+    @staticmethod
+    def _image_block(image_bytes: bytes) -> Dict[str, Any]:
+        """Wraps JPEG bytes in a base64 Claude `image` content block."""
+        return {
+            "type": "image",
+            "source": {
+                "type": "base64",
+                "media_type": "image/jpeg",
+                "data": base64.b64encode(image_bytes).decode("utf-8"),
+            },
+        }
+
+    async def _invoke_model(self, **invoke_kwargs) -> Dict[str, Any]:
+        """Calls `invoke_model` within the adaptive concurrency limit.
+
+        Throttled requests shrink the limit and are retried with exponential
+        backoff and jitter; successful ones let the limit grow back towards
+        `options.max_concurrency`. Transient failures (5xx errors, timeouts,
+        dropped connections) are retried the same way without touching the limit.
+
+        Args:
+            **invoke_kwargs: Keyword arguments for `invoke_model`.
+
+        Returns:
+            The decoded JSON response body.
+
+        Raises:
+            ClientError: If the request fails permanently, or still fails
+                after all retries.
+            botocore.exceptions.ConnectionError: If the endpoint is still
+                unreachable after all retries.
+            botocore.exceptions.HTTPClientError: If reads still time out or
+                connections still drop after all retries.
+        """
+        attempt = 0
+        while True:
+            async with self._limiter as generation:
+                try:
+                    response = await self.bedrock_client.invoke_model(**invoke_kwargs)
+                    response_body = json.loads(await response.get("body").read())
+                except ClientError as e:
+                    error = e.response.get("Error", {})
+                    status = e.response.get("ResponseMetadata", {}).get("HTTPStatusCode", 0)
+                    throttled = error.get("Code") in _THROTTLING_ERROR_CODES
+                    if attempt >= _MAX_RETRIES or not (
+                        throttled or error.get("Code") in _TRANSIENT_ERROR_CODES or status >= 500
+                    ):
+                        raise
+                    if throttled:
+                        self._limiter.on_throttle(generation)
+                    reason = error.get("Code") or f"HTTP {status}"
+                except (BotoConnectionError, HTTPClientError) as e:
+                    if attempt >= _MAX_RETRIES:
+                        raise
+                    reason = type(e).__name__
+                else:
+                    self._limiter.on_success()
+                    return response_body
+
+            delay = random.uniform(0, min(_BACKOFF_MAX, _BACKOFF_BASE * 2**attempt))
+            _log.debug(
+                f"Bedrock request failed ({reason}), retrying in {delay:.2f}s "
+                f"(limit now {self._limiter.limit})"
+            )
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _invoke_claude(self, content: List[Dict[str, Any]], max_tokens: int) -> str:
+        """Sends a single Claude 3 user message to Bedrock and returns the reply text.
+
+        Args:
+            content: The content blocks (images and text) of the user message.
+            max_tokens: Maximum number of tokens to generate.
+
+        Returns:
+            The concatenated text blocks of the model response.
+
+        Raises:
+            ValueError: If the response does not have the expected format.
+        """
+        request_body = {
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": max_tokens,
+            "temperature": self.options.temperature,
+            "messages": [{"role": "user", "content": content}],
+        }
+        if hasattr(self.options, "top_k") and self.options.top_k:
+            request_body["top_k"] = self.options.top_k
+
+        request_body_bytes = json.dumps(request_body).encode("utf-8")
+
+        invoke_kwargs = {}
+        if self.options.latency_optimized and any(
+            model in self.options.model_id for model in _LATENCY_OPTIMIZED_MODELS
+        ):
+            invoke_kwargs["performanceConfigLatency"] = "optimized"
+
+        response_body = await self._invoke_model(
+            modelId=self.options.model_id,
+            body=request_body_bytes,
+            contentType="application/json",
+            accept="application/json",
+            **invoke_kwargs,
+        )
+
+        if "content" not in response_body:
+            _log.warning(f"Unexpected response format from Bedrock: {response_body}")
+            raise ValueError("Unexpected response format")
+
+        result = ""
+        for content_item in response_body.get("content", []):
+            if content_item.get("type") == "text":
+                result += content_item.get("text", "")
+        return result.strip()
+
+    async def _call_bedrock_for_image(self, image_bytes: bytes) -> str:
         """Sends a single image to Bedrock for description.
 
-        Handles image format conversion (JPEG/PNG), base64 encoding,
-        constructing the model-specific request body (currently for Claude 3),
-        invoking the model via the Bedrock client, and parsing the response.
+        Handles constructing the model-specific request body (currently for
+        Claude 3), invoking the model via the Bedrock client, and parsing
+        the response.
 
         Args:
-            image: The PIL Image object to describe.
+            image_bytes: The JPEG-encoded image to describe.
 
         Returns:
             The textual description generated by the Bedrock model, or an
             error message if processing fails.
         """
+        if not _is_claude_3(self.options.model_id):
+            _log.warning(
+                f"Unsupported model in _call_bedrock_for_image: {self.options.model_id}"
+            )
+            return f"Unsupported model: {self.options.model_id}"
+
         try:
-            img_buffer = BytesIO()
-            try:
-                image.save(img_buffer, format="JPEG")
-                image_format = "jpeg"
-            except OSError:
-                _log.warning("Could not save as JPEG, falling back to PNG.")
-                img_buffer = BytesIO()
-                image.save(img_buffer, format="PNG")
-                image_format = "png"
-
-            image_base64 = base64.b64encode(img_buffer.getvalue()).decode("utf-8")
-
-            if self.options.model_id.startswith("anthropic.claude-3"):
-                request_body = {
-                    "anthropic_version": "bedrock-2023-05-31",
-                    "max_tokens": self.options.max_tokens,
-                    "temperature": self.options.temperature,
-                    "messages": [
-                        {
-                            "role": "user",
-                            "content": [
-                                {
-                                    "type": "image",
-                                    "source": {
-                                        "type": "base64",
-                                        "media_type": f"image/{image_format}",
-                                        "data": image_base64,
-                                    },
-                                },
-                                {"type": "text", "text": self.options.prompt},
-                            ],
-                        }
-                    ],
+            content = [
+                self._image_block(image_bytes),
+                {"type": "text", "text": self.options.prompt},
+            ]
+            return await self._invoke_claude(content, self.options.max_tokens)
+        except Exception as e:
+            _log.error(
+                f"Error processing single image with Bedrock: {str(e)}", exc_info=True
+            )
+            return f"Error processing image: {str(e)}"
+
+    async def _call_bedrock_for_images(
+        self, images: List[bytes]
+    ) -> Optional[List[str]]:
+        """Sends several images to Bedrock in a single request.
+
+        All images go into one Claude 3 user message, and the model is asked
+        to answer with a JSON array holding one description per image.
+
+        Args:
+            images: The JPEG-encoded images to describe.
+
+        Returns:
+            The descriptions in input order, error placeholders for every
+            image if the request failed, or None if the reply could not be
+            split into one description per image.
+        """
+        if not _is_claude_3(self.options.model_id):
+            return None
+
+        try:
+            content: List[Dict[str, Any]] = []
+            for index, image_bytes in enumerate(images, start=1):
+                content.append({"type": "text", "text": f"Image {index}:"})
+                content.append(self._image_block(image_bytes))
+            content.append(
+                {
+                    "type": "text",
+                    "text": self.options.prompt
+                    + "\nReturn a JSON array of descriptions, one per image, in order.",
                 }
-                if hasattr(self.options, "top_k") and self.options.top_k:
-                    request_body["top_k"] = self.options.top_k
-            else:
-                _log.warning(
-                    f"Unsupported model in _call_bedrock_for_image: {self.options.model_id}"
-                )
-                return f"Unsupported model: {self.options.model_id}"
+            )
+            result = await self._invoke_claude(
+                content, self.options.max_tokens * len(images)
+            )
+            descriptions = json.loads(result[result.find("[") : result.rfind("]") + 1])
+        except (ClientError, BotoConnectionError, HTTPClientError) as e:
+            # Sending the images one by one would only repeat the failure
+            _log.error(f"Batched Bedrock request for {len(images)} images failed: {e}")
+            return [f"Error processing image: {str(e)}"] * len(images)
+        except Exception as e:
+            _log.warning(f"Batched Bedrock reply for {len(images)} images was unusable: {e}")
+            return None
+
+        if (
+            not isinstance(descriptions, list)
+            or len(descriptions) != len(images)
+            or not all(isinstance(d, str) for d in descriptions)
+        ):
+            _log.warning("Batched Bedrock reply did not contain one description per image.")
+            return None
+
+        return [d.strip() for d in descriptions]
+
+    async def _annotate_encoded_images_async(self, images: List[bytes]) -> List[str]:
+        """Annotates a list of encoded images concurrently using Bedrock.
+
+        Identical images are sent only once, also across concurrent calls,
+        and images already described by this model instance are answered
+        from memory, or from `options.cache_dir` when it is set. The remaining ones
+        are grouped into requests of `options.images_per_request` and sent
+        concurrently, with smaller groups when `options.max_tokens` per image
+        would exceed the model's output limit. The number of requests in
+        flight is bounded by the adaptive limiter, at most
+        `options.max_concurrency`. Groups whose reply cannot be split per
+        image are retried one image per request.
+        Must run on the background event loop that owns `bedrock_client`.
+
+        Args:
+            images: A list of JPEG-encoded images.
 
-            request_body_bytes = json.dumps(request_body).encode("utf-8")
+        Returns:
+            A list of string descriptions in the same order as the input images.
+        """
 
-            response = self.bedrock_client.invoke_model(
-                modelId=self.options.model_id,
-                body=request_body_bytes,
-                contentType="application/json",
-                accept="application/json",
+        async def _describe_chunk(chunk: List[bytes]) -> List[str]:
+            if len(chunk) > 1:
+                descriptions = await self._call_bedrock_for_images(chunk)
+                if descriptions is not None:
+                    return descriptions
+            return await asyncio.gather(
+                *(self._call_bedrock_for_image(image_bytes) for image_bytes in chunk)
             )
 
-            response_body = json.loads(response.get("body").read())
+        keys = [hashlib.blake2b(image_bytes, digest_size=16).digest() for image_bytes in images]
+        described: Dict[bytes, str] = {}
+        pending: Dict[bytes, bytes] = {}
+        waiting: Dict[bytes, "asyncio.Future[str]"] = {}
+        for key, image_bytes in zip(keys, images):
+            if key in self._descriptions:
+                described[key] = self._descriptions[key]
+            elif key in self._in_flight:
+                # Another call is already describing this image; share its result
+                waiting[key] = self._in_flight[key]
+            elif key not in pending:
+                pending[key] = image_bytes
+
+        loop = asyncio.get_running_loop()
+        owned = list(pending)
+        for key in owned:
+            self._in_flight[key] = loop.create_future()
 
-            if self.options.model_id.startswith("anthropic.claude-3"):
-                result = ""
-                if "content" in response_body:
-                    for content_item in response_body.get("content", []):
-                        if content_item.get("type") == "text":
-                            result += content_item.get("text", "")
-                    return result.strip()
-                else:
-                    _log.warning(
-                        f"Unexpected response format from Bedrock: {response_body}"
+        try:
+            if self.options.cache_dir is not None and pending:
+                cached = await asyncio.to_thread(self._read_disk_cache, list(pending))
+                for key, description in cached.items():
+                    del pending[key]
+                    described[key] = description
+                    self._remember(key, description)
+
+            unique_images = list(pending.values())
+            size = max(
+                1,
+                min(
+                    self.options.images_per_request,
+                    _MAX_OUTPUT_TOKENS // max(1, self.options.max_tokens),
+                ),
+            )
+            chunks = [unique_images[i : i + size] for i in range(0, len(unique_images), size)]
+            results = await asyncio.gather(*(_describe_chunk(chunk) for chunk in chunks))
+
+            fresh: Dict[bytes, str] = {}
+            for key, description in zip(
+                pending, (d for chunk_results in results for d in chunk_results)
+            ):
+                described[key] = description
+                if not description.startswith(_ERROR_PREFIXES):
+                    self._remember(key, description)
+                    fresh[key] = description
+
+            if self.options.cache_dir is not None and fresh:
+                await asyncio.to_thread(self._write_disk_cache, fresh)
+        finally:
+            for key in owned:
+                future = self._in_flight.pop(key)
+                if not future.done():
+                    future.set_result(
+                        described.get(key, "Error processing image: Request was not completed")
                     )
-                    return "Error processing image: Unexpected response format"
-            else:
-                return str(response_body).strip()
 
+        for key, future in waiting.items():
+            described[key] = await future
+
+        return [described[key] for key in keys]
+
+    def _remember(self, key: bytes, description: str) -> None:
+        """Stores a description in the bounded in-memory cache of this instance."""
+        if len(self._descriptions) >= _DESCRIPTION_CACHE_SIZE:
+            self._descriptions.pop(next(iter(self._descriptions)))
+        self._descriptions[key] = description
+
+    def _disk_cache_path(self, key: bytes) -> Path:
+        """Returns the cache file for an image digest under `options.cache_dir`.
+
+        The file name also covers the model ID and prompt, so changing
+        either of them never returns a stale description.
+        """
+        digest = hashlib.blake2b(
+            self.options.model_id.encode("utf-8")
+            + b"\0"
+            + self.options.prompt.encode("utf-8")
+            + b"\0"
+            + key
+        ).hexdigest()
+        return Path(self.options.cache_dir) / digest[:2] / f"{digest}.json"
+
+    def _read_disk_cache(self, keys: List[bytes]) -> Dict[bytes, str]:
+        """Loads the descriptions cached on disk for the given image digests.
+
+        Args:
+            keys: Image digests to look up.
+
+        Returns:
+            The cached descriptions of the digests that were found.
+        """
+        cached = {}
+        for key in keys:
+            try:
+                with self._disk_cache_path(key).open("r", encoding="utf-8") as fp:
+                    cached[key] = json.load(fp)["description"]
+            except FileNotFoundError:
+                continue
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                _log.warning(f"Ignoring unreadable description cache entry: {e}")
+        return cached
+
+    def _write_disk_cache(self, descriptions: Dict[bytes, str]) -> None:
+        """Stores descriptions on disk, replacing each cache file atomically.
+
+        Args:
+            descriptions: Descriptions keyed by image digest.
+        """
+        for key, description in descriptions.items():
+            path = self._disk_cache_path(key)
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with tempfile.NamedTemporaryFile(
+                    "w", encoding="utf-8", dir=path.parent, suffix=".tmp", delete=False
+                ) as fp:
+                    json.dump({"description": description}, fp)
+                os.replace(fp.name, path)
+            except OSError as e:
+                _log.warning(f"Could not write description cache entry {path}: {e}")
+
+    def _submit_encoded_images(self, images: List[bytes]) -> "Future[List[str]]":
+        """Schedules the annotation of encoded images without waiting for it.
+
+        Lets callers keep preparing further images while Bedrock requests
+        are in flight on the background event loop.
+
+        Args:
+            images: A list of images as returned by `_encode_image`.
+
+        Returns:
+            A future resolving to the descriptions, in input order.
+        """
+        return asyncio.run_coroutine_threadsafe(
+            self._annotate_encoded_images_async(images), _get_event_loop()
+        )
+
+    def _annotate_encoded_images(self, images: List[bytes]) -> List[str]:
+        """Annotates a list of JPEG-encoded images concurrently using Bedrock.
+
+        Runs `_annotate_encoded_images_async` on the background event loop
+        and waits for the result.
+
+        Args:
+            images: A list of images as returned by `_encode_image`.
+
+        Returns:
+            A list of string descriptions corresponding to the input images,
+            including error messages for failed images.
+        """
+        if not images:
+            return []
+
+        try:
+            return self._submit_encoded_images(images).result()
         except Exception as e:
-            _log.error(
-                f"Error processing single image with Bedrock: {str(e)}", exc_info=True
-            )
-            return f"Error processing image: {str(e)}"
+            _log.error(f"Error occurred during async execution: {e}", exc_info=True)
+            return [f"Error processing image: Event loop failed ({e})"] * len(images)
 
-    def _annotate_images(self, images: List[Image.Image]) -> Iterable[str]:
+    def _annotate_images(self, images: Iterable[Image.Image]) -> Iterable[str]:
         """Annotates a list of images concurrently using Bedrock.
 
-        Uses a ThreadPoolExecutor to parallelize calls to `_call_bedrock_for_image`
-        for each image in the input list.
+        Synchronous entry point used by Docling; encodes each image once
+        and passes the bytes to `_annotate_encoded_images`. Images smaller
+        than `options.min_image_pixels` are not sent and get an empty description,
+        which `__call__` drops instead of attaching as an annotation.
 
         Args:
-            images: A list of PIL Image objects.
+            images: An iterable of PIL Image objects.
 
         Returns:
             An iterable (typically a list) of string descriptions corresponding
             to the input images, including error messages for failed images.
         """
-        results = []
-        with ThreadPoolExecutor(max_workers=self.options.max_workers) as executor:
-            results_iterator = executor.map(self._call_bedrock_for_image, images)
+        encoded_images: List[Optional[bytes]] = []
+        descriptions: List[Optional[str]] = []
+        for image in images:
+            if image.size[0] * image.size[1] < self.options.min_image_pixels:
+                encoded_images.append(None)
+                descriptions.append("")
+                continue
             try:
-                results = list(results_iterator)
+                encoded_images.append(self._encode_image(image))
+                descriptions.append(None)
             except Exception as e:
-                _log.error(
-                    f"Error occurred during threaded execution: {e}", exc_info=True
-                )
-                num_processed = len(results)
-                results.extend(
-                    [f"Error processing image: Thread pool failed ({e})"]
-                    * (len(images) - num_processed)
-                )
-
-        return results
+                _log.error(f"Error encoding image: {e}", exc_info=True)
+                encoded_images.append(None)
+                descriptions.append("Error processing image: Could not encode image")
+
+        valid_images = [image_bytes for image_bytes in encoded_images if image_bytes is not None]
+        results = iter(self._annotate_encoded_images(valid_images))
+        return [
+            description if description is not None else next(results)
+            for description in descriptions
+        ]
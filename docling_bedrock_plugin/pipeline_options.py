@@ -1,5 +1,7 @@
 """Configuration options specifically for using AWS Bedrock API for image description."""
+from pathlib import Path
 from typing import ClassVar, Literal, Optional, Dict, Any
+from pydantic import AliasChoices, Field
 from docling.datamodel.pipeline_options import PictureDescriptionBaseOptions
 
 
@@ -16,7 +18,23 @@ class PictureDescriptionBedrockApiOptions(PictureDescriptionBaseOptions):
         region_name: Optional AWS region name. If None, uses boto3 default configuration.
         profile_name: Optional AWS profile name from credentials file. If None, uses boto3 default.
         timeout: Timeout in seconds for API requests.
-        max_workers: Maximum number of concurrent API calls for processing images.
+        max_concurrency: Maximum number of concurrent API calls for processing images.
+            The effective limit is lowered automatically while Bedrock throttles requests.
+            Also accepted under its former name, `max_workers`.
+        max_pool_connections: Size of the HTTP connection pool used by the Bedrock client.
+            Keep it at or above `max_concurrency` so requests never wait for a free connection.
+        images_per_request: Number of images sent to the model in a single request. Fewer are
+            sent together when `max_tokens` per image would exceed the model's output limit.
+            Replies that cannot be split per image are retried one image per request.
+        max_image_edge: Images are downscaled so their longest edge is at most this many
+            pixels before upload (Claude does not benefit from larger inputs).
+        jpeg_quality: JPEG quality (1-95) used when encoding images for upload.
+        min_image_pixels: Images with fewer pixels (width * height) than this, such as
+            icons and spacers, are not sent to Bedrock and get no description annotation.
+        cache_dir: Optional directory where descriptions are cached on disk, keyed by model ID,
+            prompt and image content, so repeated runs skip Bedrock for known images.
+        latency_optimized: Request Bedrock's latency-optimized inference. Currently only
+            applied to Claude 3.5 Haiku; ignored for all other models.
         temperature: Controls randomness in generation (0.0-1.0). Lower is more deterministic.
         max_tokens: Maximum number of tokens to generate in the description.
         top_k: Top-k filtering parameter for generation.
@@ -31,12 +49,31 @@ class PictureDescriptionBedrockApiOptions(PictureDescriptionBaseOptions):
     timeout: float = 30
 
     # Concurrency control
-    max_workers: int = 3  # Default number of concurrent requests
+    max_concurrency: int = Field(
+        default=32,  # asyncio requests are cheap, so no thread-count ceiling applies
+        validation_alias=AliasChoices("max_concurrency", "max_workers"),
+    )
+    max_pool_connections: int = 50
+    images_per_request: int = 4
+
+    # Image preprocessing
+    max_image_edge: int = 1568
+    jpeg_quality: int = 85
+    min_image_pixels: int = 64 * 64
+
+    # Persistent description cache
+    cache_dir: Optional[Path] = None
 
     # Inference parameters
+    latency_optimized: bool = False
     temperature: float = 0.5
     max_tokens: int = 200
     top_k: int = 250
 
     prompt: str = "Describe this image in a few sentences."
     provenance: str = "amazon-bedrock"
+
+    @property
+    def max_workers(self) -> int:
+        """Deprecated alias for `max_concurrency`."""
+        return self.max_concurrency
@@ -9,29 +9,40 @@ Usage:
     # Or for other document types:
     python bedrock_image_description.py /path/to/your/document.docx
     python bedrock_image_description.py /path/to/your/presentation.pptx
+    
+    # Several documents at once:
+    python bedrock_image_description.py report.pdf slides.pptx notes.docx
+    
+    # Choose the output formats (default: md,json):
+    python bedrock_image_description.py /path/to/your/document.pdf --formats md,json,yaml
 """
 
+import argparse
+import asyncio
 import os
 import sys
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, List
+from typing import AbstractSet, Iterator, Optional, List, Tuple
 import json
 import yaml
 
 # Third-party imports 
 import boto3
+import orjson
 from dotenv import load_dotenv
 
 # Docling imports
 from docling_core.types.doc import DoclingDocument, PictureItem
-from docling.datamodel.base_models import (
-    InputFormat,
+from docling.datamodel.base_models import InputFormat
+from docling.datamodel.pipeline_options import AcceleratorOptions
+from docling.document_converter import (
+    DocumentConverter,
+    PdfFormatOption,
     WordFormatOption,
     PowerpointFormatOption,
 )
-from docling.datamodel.pipeline_options import AcceleratorOptions
-from docling.document_converter import DocumentConverter, PdfFormatOption
 from docling.pipeline.simple_pipeline import SimplePipeline
 from docling.pipeline.standard_pdf_pipeline import StandardPdfPipeline
 from docling.backend.pypdfium2_backend import PyPdfiumDocumentBackend
@@ -52,6 +63,40 @@ from docling_core.types.doc import TextItem, DocItemLabel, RefItem
 logging.basicConfig(level=logging.INFO)
 _log = logging.getLogger(__name__)
 
+# Output formats written by process_document
+OUTPUT_FORMATS = ("md", "json", "yaml")
+DEFAULT_OUTPUT_FORMATS = frozenset({"md", "json"})
+
+# Whether the .env file has already been loaded in this process
+_env_loaded = False
+
+# Pipeline and backend used for each supported input format, built once
+_FORMAT_OPTIONS = {
+    InputFormat.PDF: PdfFormatOption(
+        pipeline_cls=StandardPdfPipeline,
+        backend=PyPdfiumDocumentBackend,
+    ),
+    InputFormat.DOCX: WordFormatOption(
+        pipeline_cls=SimplePipeline,
+        backend=MsWordDocumentBackend,
+    ),
+    InputFormat.PPTX: PowerpointFormatOption(
+        pipeline_cls=SimplePipeline,
+        backend=MsPowerpointDocumentBackend,
+    ),
+}
+
+# Prefer PyYAML's C (libyaml) dumper when it is available
+_YamlDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+def _ensure_env_loaded() -> None:
+    """Load environment variables from a .env file, once per process."""
+    global _env_loaded
+    if not _env_loaded:
+        load_dotenv()
+        _env_loaded = True
+
 
 def add_bedrock_picture_descriptions(
     doc: DoclingDocument,
@@ -85,126 +130,187 @@ def add_bedrock_picture_descriptions(
         return
     
     _log.info(f"Processing {len(doc.pictures)} images in the document...")
-    pictures_to_process = []
-    images_to_process = []
+    # Index text and group items by reference for constant-time lookups
+    ref_index = {t.self_ref: t for t in doc.texts}
+    ref_index.update({g.self_ref: g for g in doc.groups})
     
-    # Extract images from the document
-    for picture in doc.pictures:
+    def extract_image(picture: PictureItem) -> Optional[bytes]:
+        """Decode a picture and encode it for Bedrock; None if it should be skipped."""
         try:
             img = picture.get_image(doc=doc)
-            if img:
-                pictures_to_process.append(picture)
-                images_to_process.append(img)
-            else:
-                _log.warning(f"Could not retrieve image for PictureItem {picture.self_ref}")
         except Exception as e:
-            _log.error(f"Error getting image: {e}")
+            _log.error(f"Error getting image for PictureItem {picture.self_ref}: {e}")
+            return None
+        if img is None:
+            _log.warning(f"Could not retrieve image for PictureItem {picture.self_ref}")
+            return None
+        if img.size[0] * img.size[1] < bedrock_options.min_image_pixels:
+            _log.debug(f"Skipping small image {img.size} for PictureItem {picture.self_ref}")
+            return None
+        try:
+            return bedrock_model._encode_image(img)
+        except Exception as e:
+            _log.error(f"Error encoding image for PictureItem {picture.self_ref}: {e}")
+            return None
     
-    if not images_to_process:
-        _log.info("No valid images found to process.")
-        return
+    def encoded_pictures() -> Iterator[Tuple[PictureItem, bytes]]:
+        """Yield (picture, encoded image) pairs in document order, skipping unusable pictures."""
+        # Decode in a thread pool so extraction overlaps with in-flight Bedrock requests
+        decode_workers = max(2, (os.cpu_count() or 2) // 2)
+        skipped = 0
+        with ThreadPoolExecutor(max_workers=decode_workers) as executor:
+            for picture, image_bytes in zip(
+                doc.pictures, executor.map(extract_image, doc.pictures)
+            ):
+                if image_bytes is None:
+                    skipped += 1
+                    continue
+                yield picture, image_bytes
+        if skipped:
+            _log.info(f"Skipped {skipped} pictures without a usable image")
+    
+    pictures_to_process = []
+    pending_requests = []
+    batch = []
     
-    # Process the images using Bedrock
-    _log.info(f"Sending {len(images_to_process)} images to Bedrock for description...")
+    # Hand each full batch to Bedrock as soon as its images are ready
     try:
-        results_iterable = bedrock_model._annotate_images(images_to_process)
-        descriptions = list(results_iterable)
+        for picture, image_bytes in encoded_pictures():
+            pictures_to_process.append(picture)
+            batch.append(image_bytes)
+            if len(batch) >= bedrock_options.images_per_request:
+                pending_requests.append(bedrock_model._submit_encoded_images(batch))
+                batch = []
+        if batch:
+            pending_requests.append(bedrock_model._submit_encoded_images(batch))
+        
+        if not pictures_to_process:
+            _log.info("No valid images found to process.")
+            return
+        
+        # Wait for the descriptions from Bedrock
+        _log.info(f"Waiting for Bedrock descriptions of {len(pictures_to_process)} images...")
+        descriptions = [
+            description
+            for request in pending_requests
+            for description in request.result()
+        ]
     except Exception as e:
         _log.error(f"Error during Bedrock image processing: {e}")
         return
     
-    # Add the descriptions to the document
+    if len(descriptions) != len(pictures_to_process):
+        _log.error(
+            f"Got {len(descriptions)} descriptions for {len(pictures_to_process)} images; "
+            "not adding them to the document."
+        )
+        return
+    
+    # Add the descriptions to the document: first collect every change,
+    # then apply them in one pass
     _log.info(f"Adding {len(descriptions)} descriptions to the document...")
+    description_prefix = "\n\nImage Description: "
+    caption_updates = []  # (existing caption item, text to append)
+    new_captions = []  # (picture, parent item, caption text)
+    
     for picture, description in zip(pictures_to_process, descriptions):
-        if not description.startswith("Error") and not description.startswith("Unsupported"):
-            # Add the description as an annotation
-            picture.annotations.append(
-                PictureDescriptionData(
-                    text=description, 
-                    provenance=bedrock_model.provenance
-                )
+        if not description or description.startswith(("Error", "Unsupported")):
+            continue
+        
+        # Add the description as an annotation
+        picture.annotations.append(
+            PictureDescriptionData(
+                text=description, 
+                provenance=bedrock_model.provenance
             )
-            
-            # Add or append to caption for visibility in exports
-            caption_ref_list = picture.captions
-            description_prefix = "\n\nImage Description: "
-            
-            if caption_ref_list:
-                # Append to existing caption
-                caption_item_ref = caption_ref_list[0].ref
-                caption_item = next((t for t in doc.texts if t.self_ref == caption_item_ref), None)
-                if isinstance(caption_item, TextItem):
-                    caption_item.text += description_prefix + description
-            else:
-                # Create a new caption
-                parent_ref = picture.parent.cref if picture.parent else None
-                parent_item = doc.body  # Default to document body
-                
-                # Try to find the parent item
-                if parent_ref:
-                    parent_item = next((t for t in doc.texts if t.self_ref == parent_ref), None)
-                    if parent_item is None:
-                        parent_item = next((g for g in doc.groups if g.self_ref == parent_ref), None)
-                    if parent_item is None:
-                        parent_item = doc.body
-                
-                # Create the caption
-                new_caption_item = doc.add_text(
-                    text=description_prefix.strip() + description,
-                    label=DocItemLabel.CAPTION,
-                    parent=parent_item,
-                )
-                
-                # Link the caption to the picture
-                if new_caption_item:
-                    picture.captions.append(RefItem(cref=new_caption_item.self_ref))
+        )
+        
+        # Add or append to caption for visibility in exports
+        if picture.captions:
+            # Append to existing caption
+            caption_item = ref_index.get(picture.captions[0].cref)
+            if isinstance(caption_item, TextItem):
+                caption_updates.append((caption_item, description_prefix + description))
+        else:
+            # Create a new caption under the picture's parent, defaulting to the document body
+            parent_item = doc.body
+            if picture.parent:
+                parent_item = ref_index.get(picture.parent.cref, doc.body)
+            new_captions.append(
+                (picture, parent_item, description_prefix.strip() + description)
+            )
+    
+    for caption_item, text in caption_updates:
+        caption_item.text += text
+    
+    # doc.add_text only appends to doc.texts and the parent's children, so
+    # going through it keeps references consistent at no extra cost
+    for picture, parent_item, text in new_captions:
+        new_caption_item = doc.add_text(
+            text=text,
+            label=DocItemLabel.CAPTION,
+            parent=parent_item,
+        )
+        # Link the caption to the picture
+        picture.captions.append(RefItem(cref=new_caption_item.self_ref))
     
     _log.info("Completed Bedrock image description processing")
 
 
-def process_document(input_path: Path, output_dir: Path) -> None:
-    """Process a document and generate image descriptions using AWS Bedrock."""
-    
-    # Load potential environment variables from .env file
-    load_dotenv()
-    
-    # Configure the document converter
-    doc_converter = DocumentConverter(
-        allowed_formats=[InputFormat.PDF, InputFormat.DOCX, InputFormat.PPTX],
-        format_options={
-            InputFormat.PDF: PdfFormatOption(
-                pipeline_cls=StandardPdfPipeline,
-                backend=PyPdfiumDocumentBackend,
-            ),
-            InputFormat.DOCX: WordFormatOption(
-                pipeline_cls=SimplePipeline,
-                backend=MsWordDocumentBackend,
-            ),
-            InputFormat.PPTX: PowerpointFormatOption(
-                pipeline_cls=SimplePipeline,
-                backend=MsPowerpointDocumentBackend,
-            ),
-        },
+def _write_markdown(md_path: Path, doc: DoclingDocument) -> None:
+    """Write the Markdown export of a document."""
+    with md_path.open("w", encoding="utf-8") as fp:
+        fp.write(doc.export_to_markdown())
+
+
+def _write_json(json_path: Path, dumped: dict) -> None:
+    """Write a dumped document as indented JSON."""
+    json_path.write_bytes(
+        orjson.dumps(
+            dumped,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY,
+        )
     )
-    
-    # Configure AWS Bedrock options
-    bedrock_options = PictureDescriptionBedrockApiOptions(
+
+
+def _write_yaml(yaml_path: Path, dumped: dict) -> None:
+    """Write a dumped document as YAML."""
+    with yaml_path.open("w", encoding="utf-8") as fp:
+        yaml.dump(
+            dumped,
+            fp,
+            Dumper=_YamlDumper,
+            allow_unicode=True,
+            indent=2,
+        )
+
+
+def _bedrock_options() -> PictureDescriptionBedrockApiOptions:
+    """AWS Bedrock options used by this example."""
+    return PictureDescriptionBedrockApiOptions(
         model_id="anthropic.claude-3-sonnet-20240229-v1:0",  # Choose your preferred model
         # region_name="us-east-1",  # Uncomment and set if needed
         prompt="Describe this image concisely. Include main visual elements and context.",
         max_tokens=250,
         temperature=0.3,
-        max_workers=3,
+        max_concurrency=32,
     )
-    
-    # Process the document
+
+
+async def _convert_and_describe(
+    input_path: Path,
+    doc_converter: DocumentConverter,
+    bedrock_options: PictureDescriptionBedrockApiOptions,
+) -> Optional[Tuple[str, DoclingDocument]]:
+    """Convert a document and describe its pictures; returns (file stem, document) or None."""
     _log.info(f"Processing document: {input_path}")
-    conv_results = doc_converter.convert_all([input_path])
-    conv_result = conv_results[0]  # Get the first result
+    conv_result = await asyncio.to_thread(
+        doc_converter.convert, input_path, raises_on_error=False
+    )
     
     if conv_result.status != "success":
         _log.error(f"Failed to convert {conv_result.input.file.name}")
-        return
+        return None
     
     _log.info(f"Successfully converted {conv_result.input.file.name}")
     doc = conv_result.document  # This is the DoclingDocument object
@@ -212,52 +318,190 @@ def process_document(input_path: Path, output_dir: Path) -> None:
     # Process images with Bedrock if they exist
     if doc.pictures:
         _log.info(f"Found {len(doc.pictures)} pictures in the document")
-        add_bedrock_picture_descriptions(doc, bedrock_options)
+        await asyncio.to_thread(add_bedrock_picture_descriptions, doc, bedrock_options)
     else:
         _log.info("No pictures found in the document")
     
-    # Save outputs
+    return conv_result.input.file.stem, doc
+
+
+async def _save_outputs(
+    doc: DoclingDocument,
+    stem: str,
+    output_dir: Path,
+    formats: AbstractSet[str],
+) -> None:
+    """Write the requested exports of a document concurrently in worker threads."""
     _log.info(f"Saving outputs to {output_dir}")
     
-    # Save markdown
-    md_path = output_dir / f"{conv_result.input.file.stem}.md"
-    with md_path.open("w", encoding="utf-8") as fp:
-        fp.write(doc.export_to_markdown())
-    _log.info(f"Saved Markdown to: {md_path}")
+    async def save_markdown() -> None:
+        md_path = output_dir / f"{stem}.md"
+        await asyncio.to_thread(_write_markdown, md_path, doc)
+        _log.info(f"Saved Markdown to: {md_path}")
     
-    # Save JSON (includes Bedrock annotations)
-    json_path = output_dir / f"{conv_result.input.file.stem}.json"
-    with json_path.open("w", encoding="utf-8") as fp:
-        fp.write(doc.model_dump_json(indent=2))
-    _log.info(f"Saved JSON to: {json_path}")
+    async def save_json(dumped: dict) -> None:
+        json_path = output_dir / f"{stem}.json"
+        await asyncio.to_thread(_write_json, json_path, dumped)
+        _log.info(f"Saved JSON to: {json_path}")
     
-    # Save YAML
-    yaml_path = output_dir / f"{conv_result.input.file.stem}.yaml"
-    with yaml_path.open("w", encoding="utf-8") as fp:
-        yaml.safe_dump(doc.model_dump(mode="json"), fp, allow_unicode=True, indent=2)
-    _log.info(f"Saved YAML to: {yaml_path}")
+    async def save_yaml(dumped: dict) -> None:
+        yaml_path = output_dir / f"{stem}.yaml"
+        await asyncio.to_thread(_write_yaml, yaml_path, dumped)
+        _log.info(f"Saved YAML to: {yaml_path}")
+    
+    async def save_dumped() -> None:
+        # Dump the document once; the JSON and YAML exports share the result
+        dumped = await asyncio.to_thread(doc.model_dump, mode="json")
+        writers = []
+        if "json" in formats:
+            writers.append(save_json(dumped))
+        if "yaml" in formats:
+            writers.append(save_yaml(dumped))
+        await asyncio.gather(*writers)
+    
+    savers = []
+    if "md" in formats:
+        savers.append(save_markdown())
+    if "json" in formats or "yaml" in formats:
+        savers.append(save_dumped())
+    await asyncio.gather(*savers)
+
+
+async def process_documents_async(
+    input_paths: List[Path],
+    output_dir: Path,
+    formats: AbstractSet[str] = DEFAULT_OUTPUT_FORMATS,
+) -> List[Path]:
+    """
+    Process several documents and generate image descriptions using AWS Bedrock.
+    
+    Documents are converted and described one after another, while the
+    exports of each document are written in the background during the
+    conversion of the next one. A document that fails is logged and
+    skipped; the remaining documents are still processed.
+    
+    Args:
+        input_paths: Paths to PDF, Word or PowerPoint documents
+        output_dir: Directory where the exports are written
+        formats: Output formats to write, any of "md", "json" and "yaml"
+    
+    Returns:
+        The input paths that could not be converted
+    """
+    
+    # Load potential environment variables from .env file
+    _ensure_env_loaded()
+    
+    # Configure the document converter
+    doc_converter = DocumentConverter(
+        allowed_formats=list(_FORMAT_OPTIONS),
+        format_options=_FORMAT_OPTIONS,
+    )
+    
+    # Configure AWS Bedrock options
+    bedrock_options = _bedrock_options()
+    
+    failed = []
+    pending_save = None
+    try:
+        for input_path in input_paths:
+            try:
+                result = await _convert_and_describe(input_path, doc_converter, bedrock_options)
+            except Exception as e:
+                _log.error(f"Error processing {input_path}: {e}", exc_info=True)
+                result = None
+            if result is None:
+                failed.append(input_path)
+            # Keep at most one document's exports in flight
+            if pending_save is not None:
+                await pending_save
+                pending_save = None
+            if result is not None:
+                stem, doc = result
+                pending_save = asyncio.create_task(
+                    _save_outputs(doc, stem, output_dir, formats)
+                )
+    finally:
+        # Finish the previous document's exports even if a later one failed
+        if pending_save is not None:
+            await pending_save
+    
+    return failed
+
+
+async def process_document_async(
+    input_path: Path,
+    output_dir: Path,
+    formats: AbstractSet[str] = DEFAULT_OUTPUT_FORMATS,
+) -> None:
+    """
+    Process a document and generate image descriptions using AWS Bedrock.
+    
+    Conversion, Bedrock calls, serialization and file writes all run in
+    worker threads, so the event loop stays free for other documents.
+    
+    Args:
+        input_path: Path to the PDF, Word or PowerPoint document
+        output_dir: Directory where the exports are written
+        formats: Output formats to write, any of "md", "json" and "yaml"
+    """
+    await process_documents_async([input_path], output_dir, formats)
+
+
+def process_document(
+    input_path: Path,
+    output_dir: Path,
+    formats: AbstractSet[str] = DEFAULT_OUTPUT_FORMATS,
+) -> None:
+    """
+    Process a document and generate image descriptions using AWS Bedrock.
+    
+    Synchronous wrapper around `process_document_async` that starts its own
+    event loop. It cannot be called while an event loop is already running
+    in the current thread (e.g. in Jupyter or an async application); await
+    `process_document_async` there instead.
+    """
+    asyncio.run(process_document_async(input_path, output_dir, formats))
 
 
 def main():
     """Main entry point function."""
-    # Check for input document
-    if len(sys.argv) < 2:
-        print(f"Usage: {sys.argv[0]} /path/to/document.[pdf|docx|pptx]")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        description="Convert documents with Docling and describe their images using AWS Bedrock."
+    )
+    parser.add_argument(
+        "input_paths", type=Path, nargs="+", help="Paths to PDF, DOCX or PPTX documents"
+    )
+    parser.add_argument(
+        "--formats",
+        default=",".join(sorted(DEFAULT_OUTPUT_FORMATS)),
+        help=f"Comma-separated output formats to write ({','.join(OUTPUT_FORMATS)}). Default: %(default)s",
+    )
+    args = parser.parse_args()
     
-    # Get input document path
-    input_path = Path(sys.argv[1])
-    if not input_path.exists():
-        print(f"Error: File not found: {input_path}")
-        sys.exit(1)
+    formats = {f.strip().lower() for f in args.formats.split(",") if f.strip()}
+    unknown = formats - set(OUTPUT_FORMATS)
+    if unknown:
+        parser.error(f"Unknown output format(s): {', '.join(sorted(unknown))}")
+    
+    # Check the input document paths
+    for input_path in args.input_paths:
+        if not input_path.exists():
+            print(f"Error: File not found: {input_path}")
+            sys.exit(1)
     
     # Create output directory
     output_dir = Path("./output")
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    # Process the document
-    process_document(input_path, output_dir)
+    # Process the documents
+    failed = asyncio.run(process_documents_async(args.input_paths, output_dir, formats))
+    if failed:
+        print(f"Error: Could not process {len(failed)} of {len(args.input_paths)} documents:")
+        for input_path in failed:
+            print(f"  {input_path}")
+        sys.exit(1)
     
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
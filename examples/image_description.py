@@ -55,6 +55,10 @@ def describe_image(image_path: Path) -> str:
         # Load the image
         _log.info(f"Loading image: {image_path}")
         img = Image.open(image_path)
+        # Let JPEG sources decode at a reduced scale instead of full resolution
+        max_edge = bedrock_options.max_image_edge
+        img.draft("RGB", (max_edge, max_edge))
+        img.load()
         
         # Process the image
         _log.info(f"Sending image to AWS Bedrock for description...")
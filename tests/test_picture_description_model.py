@@ -0,0 +1,262 @@
+"""Tests for PictureDescriptionBedrockApiModel against a stub Bedrock client."""
+import asyncio
+import base64
+from io import BytesIO
+import json
+
+import pytest
+from botocore.exceptions import ClientError
+from PIL import Image
+
+from docling.datamodel.pipeline_options import AcceleratorOptions
+from docling_bedrock_plugin import picture_description_model
+from docling_bedrock_plugin.picture_description_model import (
+    PictureDescriptionBedrockApiModel,
+    _AdaptiveLimiter,
+)
+from docling_bedrock_plugin.pipeline_options import PictureDescriptionBedrockApiOptions
+
+
+class _Body:
+    def __init__(self, text: str):
+        self._text = text
+
+    async def read(self) -> bytes:
+        return json.dumps({"content": [{"type": "text", "text": self._text}]}).encode("utf-8")
+
+
+class StubBedrockClient:
+    """Answers `invoke_model` like Claude 3, describing each image by its bytes.
+
+    `errors` are raised, in order, by the first calls; `reply` can override
+    the text returned for a batched request.
+    """
+
+    def __init__(self, errors=(), reply=None, delay=0.0):
+        self.errors = list(errors)
+        self.reply = reply
+        self.delay = delay
+        self.calls = []
+
+    async def invoke_model(self, **kwargs):
+        body = json.loads(kwargs["body"])
+        images = [
+            base64.b64decode(block["source"]["data"]).decode("utf-8")
+            for block in body["messages"][0]["content"]
+            if block["type"] == "image"
+        ]
+        self.calls.append(images)
+        await asyncio.sleep(self.delay)
+        if self.errors:
+            raise self.errors.pop(0)
+        if len(images) == 1:
+            return {"body": _Body(f"description of {images[0]}")}
+        if self.reply is not None:
+            return {"body": _Body(self.reply)}
+        return {"body": _Body(json.dumps([f"description of {image}" for image in images]))}
+
+
+def _client_error(code: str, status: int = 400) -> ClientError:
+    return ClientError(
+        {"Error": {"Code": code}, "ResponseMetadata": {"HTTPStatusCode": status}},
+        "InvokeModel",
+    )
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(picture_description_model, "_BACKOFF_BASE", 0.0)
+
+
+@pytest.fixture
+def make_model(monkeypatch):
+    def factory(client, **options):
+        monkeypatch.setattr(
+            picture_description_model, "_get_bedrock_client", lambda *args: client
+        )
+        return PictureDescriptionBedrockApiModel(
+            enabled=True,
+            enable_remote_services=True,
+            artifacts_path=None,
+            options=PictureDescriptionBedrockApiOptions(**options),
+            accelerator_options=AcceleratorOptions(),
+        )
+
+    return factory
+
+
+def test_duplicates_across_concurrent_batches_are_sent_once(make_model):
+    client = StubBedrockClient(delay=0.01)
+    model = make_model(client, images_per_request=2)
+
+    async def annotate_both():
+        return await asyncio.gather(
+            model._annotate_encoded_images_async([b"a", b"b", b"a"]),
+            model._annotate_encoded_images_async([b"b", b"c"]),
+        )
+
+    first, second = asyncio.run(annotate_both())
+
+    assert first == ["description of a", "description of b", "description of a"]
+    assert second == ["description of b", "description of c"]
+    assert sorted(image for call in client.calls for image in call) == ["a", "b", "c"]
+    assert model._in_flight == {}
+
+
+def test_described_images_are_answered_from_memory(make_model):
+    client = StubBedrockClient()
+    model = make_model(client)
+
+    asyncio.run(model._annotate_encoded_images_async([b"a"]))
+    result = asyncio.run(model._annotate_encoded_images_async([b"a"]))
+
+    assert result == ["description of a"]
+    assert len(client.calls) == 1
+
+
+def test_limiter_halves_once_per_throttle_burst():
+    limiter = _AdaptiveLimiter(32)
+
+    for _ in range(20):
+        limiter.on_throttle(0)
+    assert limiter.limit == 16
+
+    limiter.on_throttle(1)
+    assert limiter.limit == 8
+
+
+def test_limiter_grows_back_after_successes():
+    limiter = _AdaptiveLimiter(4, increase_after=2)
+    limiter.on_throttle(0)
+    assert limiter.limit == 2
+
+    for _ in range(4):
+        limiter.on_success()
+    assert limiter.limit == 4
+
+    for _ in range(4):
+        limiter.on_success()
+    assert limiter.limit == 4
+
+
+def test_throttled_requests_stop_after_the_retry_budget(make_model):
+    max_retries = picture_description_model._MAX_RETRIES
+    client = StubBedrockClient(errors=[_client_error("ThrottlingException")] * (max_retries + 1))
+    model = make_model(client, max_concurrency=8)
+
+    with pytest.raises(ClientError):
+        asyncio.run(model._invoke_claude([], max_tokens=10))
+
+    assert len(client.calls) == max_retries + 1
+    # Each retry is admitted after the previous halving, so it counts as a new burst
+    assert model._limiter.limit == 1
+
+
+def test_transient_errors_are_retried_without_lowering_the_limit(make_model):
+    client = StubBedrockClient(
+        errors=[
+            _client_error("ServiceUnavailableException", 503),
+            _client_error("SomethingElse", 500),
+        ]
+    )
+    model = make_model(client, max_concurrency=8)
+
+    assert asyncio.run(model._annotate_encoded_images_async([b"a"])) == ["description of a"]
+    assert len(client.calls) == 3
+    assert model._limiter.limit == 8
+
+
+def test_failed_batch_is_not_resent_per_image(make_model):
+    client = StubBedrockClient(errors=[_client_error("AccessDeniedException")])
+    model = make_model(client, images_per_request=4)
+
+    result = asyncio.run(model._annotate_encoded_images_async([b"a", b"b", b"c", b"d"]))
+
+    assert len(client.calls) == 1
+    assert all(description.startswith("Error processing image") for description in result)
+
+
+def test_unusable_batch_reply_falls_back_to_single_images(make_model):
+    client = StubBedrockClient(reply="not a list")
+    model = make_model(client, images_per_request=2)
+
+    result = asyncio.run(model._annotate_encoded_images_async([b"a", b"b"]))
+
+    assert result == ["description of a", "description of b"]
+    assert client.calls == [["a", "b"], ["a"], ["b"]]
+
+
+def test_batches_fit_the_output_token_limit(make_model):
+    client = StubBedrockClient()
+    model = make_model(client, images_per_request=4, max_tokens=1200)
+
+    asyncio.run(model._annotate_encoded_images_async([b"a", b"b", b"c", b"d"]))
+
+    assert [len(call) for call in client.calls] == [3, 1]
+
+
+def test_disk_cache_hit_and_miss(make_model, tmp_path):
+    first_client = StubBedrockClient()
+    first = make_model(first_client, cache_dir=tmp_path)
+    assert asyncio.run(first._annotate_encoded_images_async([b"a"])) == ["description of a"]
+    assert len(first_client.calls) == 1
+
+    cached_client = StubBedrockClient()
+    cached = make_model(cached_client, cache_dir=tmp_path)
+    result = asyncio.run(cached._annotate_encoded_images_async([b"a", b"b"]))
+    assert result == ["description of a", "description of b"]
+    assert cached_client.calls == [["b"]]
+
+    other_prompt_client = StubBedrockClient()
+    other_prompt = make_model(other_prompt_client, cache_dir=tmp_path, prompt="Other prompt")
+    asyncio.run(other_prompt._annotate_encoded_images_async([b"a"]))
+    assert other_prompt_client.calls == [["a"]]
+
+
+def test_failures_are_not_cached(make_model, tmp_path):
+    failing_client = StubBedrockClient(errors=[_client_error("AccessDeniedException")])
+    failing = make_model(failing_client, cache_dir=tmp_path)
+    result = asyncio.run(failing._annotate_encoded_images_async([b"a"]))
+    assert result[0].startswith("Error processing image")
+
+    retry_client = StubBedrockClient()
+    retry = make_model(retry_client, cache_dir=tmp_path)
+    assert asyncio.run(retry._annotate_encoded_images_async([b"a"])) == ["description of a"]
+
+
+def test_annotate_images_keeps_outputs_aligned(make_model, monkeypatch):
+    client = StubBedrockClient()
+    model = make_model(client, images_per_request=1, min_image_pixels=64 * 64)
+    broken = Image.new("RGB", (100, 100), "red")
+    encode_image = model._encode_image
+
+    def fake_encode(image):
+        if image is broken:
+            raise OSError("broken image data")
+        encode_image(image)
+        return f"{image.size[0]}x{image.size[1]}".encode("utf-8")
+
+    monkeypatch.setattr(model, "_encode_image", fake_encode)
+    images = [
+        Image.new("RGB", (100, 100)),
+        Image.new("RGB", (10, 10)),
+        broken,
+        Image.new("RGBA", (120, 80)),
+    ]
+
+    result = list(model._annotate_images(images))
+
+    assert result[0] == "description of 100x100"
+    assert result[1] == ""
+    assert result[2].startswith("Error processing image")
+    assert result[3] == "description of 120x80"
+
+
+def test_transparent_images_are_flattened_onto_white(make_model):
+    model = make_model(StubBedrockClient())
+    image = Image.new("RGBA", (100, 100), (0, 0, 0, 0))
+
+    encoded = Image.open(BytesIO(model._encode_image(image)))
+
+    assert encoded.mode == "RGB"
+    assert all(low >= 250 for low, _ in encoded.getextrema())